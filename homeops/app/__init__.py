@@ -10,11 +10,197 @@ and extend the application in the future.
 from __future__ import annotations
 
 import os
-from flask import Flask, jsonify, render_template
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import msgpack
+from flask import Flask, Response, current_app, jsonify, make_response, render_template, request
 
 from .ha_client import HAClient
 from .health.analyzer import analyze_health, build_report
 
+try:
+    from .json_provider import OrjsonProvider
+except ImportError:
+    # Without orjson (see the Dockerfile) Flask's stdlib provider is used.
+    OrjsonProvider = None
+
+# Age in seconds after which a request triggers a background refresh of
+# the report snapshot.  Set `HOMEOPS_REFRESH_INTERVAL=0` to disable the
+# snapshot and build the report on each request instead (e.g. in tests).
+_DEFAULT_REFRESH_INTERVAL = 5.0
+
+# Snapshots older than this are rebuilt before answering, so the first
+# visit after an idle period never shows an old report.
+_MAX_SNAPSHOT_AGE = 30.0
+
+# Binary alternative to JSON for programmatic `/api/report` consumers that
+# ask for it in their `Accept` header.
+_MSGPACK_MIMETYPE = "application/msgpack"
+
+# `/states` is fetched on a worker thread while the Home Assistant version
+# is looked up in the request thread; `requests` releases the GIL while
+# waiting on the socket.
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="homeops-ha")
+
+# Placeholder returned when Home Assistant cannot be reached.  Only the
+# report description varies (it carries the error message), so the rest
+# is built once and shared.
+_FALLBACK_REPORT: Dict[str, Any] = {
+    "headline": "Unable to determine health",
+    "description": "",
+    "start_here": [],
+    "details": "",
+}
+_FALLBACK_DATA: Dict[str, Any] = {
+    "ha_version": "unknown",
+    "entity_count": 0,
+    "health": {
+        "severity": "unknown",
+        "unavailable": {
+            "total_count": 0,
+            "critical_count": 0,
+            "by_domain": {},
+        },
+        "updates": {"count": 0, "items": []},
+    },
+    "report": _FALLBACK_REPORT,
+}
+
+# Most recent analyses keyed by the digest of the raw `/states` response.
+# Dashboard refreshes between state changes reuse the stored result
+# instead of walking every entity again.
+_ANALYSIS_CACHE_SIZE = 8
+_analysis_cache: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+_analysis_lock = threading.Lock()
+
+
+def _analyze(states: List[Dict[str, Any]], key: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return ``(health, report)`` for ``states``, memoized on ``key``."""
+    with _analysis_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+            return cached
+    health = analyze_health(states)
+    result = (health, build_report(health))
+    with _analysis_lock:
+        _analysis_cache[key] = result
+        while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return result
+
+
+def _build_data(client: HAClient) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Fetch Home Assistant data and assemble the view model for both routes.
+
+    Returns ``(data, etag)``.  The ETag is derived from the `/states`
+    digest and the Home Assistant version, which together determine the
+    whole view model.  If anything goes wrong (e.g. the API is
+    unavailable), fail gracefully and return a placeholder report
+    indicating unknown state, with no ETag.
+    """
+    try:
+        states_future = _EXECUTOR.submit(client.get_states_with_key)
+        ha_version = client.get_ha_version()
+        states, key = states_future.result()
+        health, report = _analyze(states, key)
+        data = {
+            "ha_version": ha_version,
+            "entity_count": len(states),
+            "health": health,
+            "report": report,
+        }
+        return data, f"{key}-{ha_version}"
+    except Exception as exc:  # pylint: disable=broad-except
+        return {**_FALLBACK_DATA, "report": {**_FALLBACK_REPORT, "description": str(exc)}}, None
+
+
+class _Refresher:
+    """Serve a recent ``(data, etag)`` snapshot and refresh it ahead of demand.
+
+    A request that finds the snapshot older than ``interval`` seconds is
+    still answered from it, but starts a single background rebuild so the
+    next request sees fresh data.  Without a snapshot, or with one older
+    than ``_MAX_SNAPSHOT_AGE``, the report is rebuilt before answering.
+    Nothing runs while no requests arrive.  Swapping the snapshot
+    attribute is atomic, so request handlers read it without a lock.
+    """
+
+    def __init__(self, client: HAClient, interval: float) -> None:
+        self._client = client
+        self._interval = interval
+        # `(built_at, (data, etag))`, with `built_at` from time.monotonic().
+        self._snapshot: Optional[Tuple[float, Tuple[Dict[str, Any], Optional[str]]]] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def current(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return a recent snapshot, refreshing it as needed."""
+        if self._interval <= 0:
+            return _build_data(self._client)
+        entry = self._snapshot
+        if entry is None:
+            return self._rebuild()
+        age = time.monotonic() - entry[0]
+        if age >= _MAX_SNAPSHOT_AGE:
+            return self._rebuild()
+        if age >= self._interval:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                threading.Thread(target=self._refresh, name="homeops-refresher", daemon=True).start()
+        return entry[1]
+
+    def _rebuild(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Build a new snapshot, store it and return it."""
+        built_at = time.monotonic()
+        snapshot = _build_data(self._client)
+        self._snapshot = (built_at, snapshot)
+        return snapshot
+
+    def _refresh(self) -> None:
+        """Rebuild the snapshot on a background thread."""
+        try:
+            self._rebuild()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+def _conditional_response(etag: Optional[str], build: Callable[[], Response]) -> Response:
+    """Return ``build()`` tagged with ``etag``, or 304 if the client already has it.
+
+    Checking `If-None-Match` before building the response lets polling
+    clients skip both template rendering and JSON encoding.  The ETag is
+    weak because the HTML and JSON views are only semantically tied to it.
+    """
+    if etag is None:
+        return build()
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def _prefers_msgpack() -> bool:
+    """Return whether the client's `Accept` header ranks MessagePack above JSON."""
+    best = request.accept_mimetypes.best_match(("application/json", _MSGPACK_MIMETYPE))
+    return best == _MSGPACK_MIMETYPE
+
+
+def _report_response(data: Dict[str, Any], use_msgpack: bool) -> Response:
+    """Encode the report as MessagePack or JSON."""
+    if use_msgpack:
+        return current_app.response_class(msgpack.packb(data), mimetype=_MSGPACK_MIMETYPE)
+    return jsonify(data)
+
 
 def create_app() -> Flask:
     """Construct and configure the Flask app.
@@ -32,93 +218,52 @@ def create_app() -> Flask:
         template_folder=os.path.join(os.path.dirname(__file__), "templates"),
         static_folder=os.path.join(os.path.dirname(__file__), "static"),
     )
+    if OrjsonProvider is not None:
+        app.json = OrjsonProvider(app)
 
-    client = HAClient()
+    # Resolve the dashboard template once rather than going through the
+    # loader on every request.
+    index_template = app.jinja_env.get_template("index.html")
+
+    # `HOMEOPS_STATES_PROJECTION=1` fetches states through Home Assistant's
+    # template API; see `STATES_PROJECTION_TEMPLATE` for the trade-off.
+    client = HAClient(states_projection=os.environ.get("HOMEOPS_STATES_PROJECTION", "0") == "1")
+
+    interval = float(os.environ.get("HOMEOPS_REFRESH_INTERVAL", _DEFAULT_REFRESH_INTERVAL))
+    refresher = _Refresher(client, interval)
 
     @app.route("/")
-    def index() -> str:
+    def index() -> Response:
         """Render the HomeOps dashboard.
 
-        On each request, fetch the latest Home Assistant configuration and
-        state, compute a health report, and render the template.  If
-        anything goes wrong (e.g. the API is unavailable), the
-        `analyze_health` function will catch exceptions and return a
-        placeholder report indicating unknown state.
+        Render a recent health report, refreshed in the background as
+        requests arrive.  If anything goes wrong (e.g. the API is
+        unavailable), a placeholder report indicating unknown state is
+        rendered instead.
         """
-        try:
-            config = client.get_config()
-            states = client.get_states()
-            health = analyze_health(states)
-            report = build_report(health)
-            data = {
-                "ha_version": config.get("version"),
-                "entity_count": len(states),
-                "health": health,
-                "report": report,
-            }
-        except Exception as exc:  # pylint: disable=broad-except
-            # If anything goes wrong, fail gracefully and mark state unknown
-            data = {
-                "ha_version": "unknown",
-                "entity_count": 0,
-                "health": {
-                    "severity": "unknown",
-                    "unavailable": {
-                        "total_count": 0,
-                        "critical_count": 0,
-                        "by_domain": {},
-                    },
-                    "updates": {"count": 0, "items": []},
-                },
-                "report": {
-                    "headline": "Unable to determine health",
-                    "description": str(exc),
-                    "start_here": [],
-                    "details": "",
-                },
-            }
-        return render_template("index.html", data=data)
+        data, etag = refresher.current()
+        return _conditional_response(etag, lambda: make_response(render_template(index_template, data=data)))
 
     @app.route("/api/report")
-    def api_report() -> "flask.Response":
+    def api_report() -> Response:
         """Return the raw health report as JSON.
 
         This endpoint can be used by tools or support personnel to
         programmatically retrieve a full diagnostic snapshot.  It
         contains the same information used by the HTML dashboard, but
-        without any of the presentation logic.
+        without any of the presentation logic.  Clients that prefer
+        ``application/msgpack`` in their `Accept` header receive the same
+        data encoded as MessagePack.
         """
-        try:
-            config = client.get_config()
-            states = client.get_states()
-            health = analyze_health(states)
-            report = build_report(health)
-            data = {
-                "ha_version": config.get("version"),
-                "entity_count": len(states),
-                "health": health,
-                "report": report,
-            }
-        except Exception as exc:  # pylint: disable=broad-except
-            data = {
-                "ha_version": "unknown",
-                "entity_count": 0,
-                "health": {
-                    "severity": "unknown",
-                    "unavailable": {
-                        "total_count": 0,
-                        "critical_count": 0,
-                        "by_domain": {},
-                    },
-                    "updates": {"count": 0, "items": []},
-                },
-                "report": {
-                    "headline": "Unable to determine health",
-                    "description": str(exc),
-                    "start_here": [],
-                    "details": "",
-                },
-            }
-        return jsonify(data)
+        data, etag = refresher.current()
+        # Negotiate before the conditional check so that each encoding has
+        # its own ETag; a cached JSON body must never validate a request
+        # for MessagePack.
+        use_msgpack = _prefers_msgpack()
+        if use_msgpack and etag is not None:
+            etag = f"{etag}-msgpack"
+        response = _conditional_response(etag, lambda: _report_response(data, use_msgpack))
+        response.vary.add("Accept")
+        return response
 
     return app
\ No newline at end of file
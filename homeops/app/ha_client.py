@@ -10,16 +10,116 @@ Assistant.
 
 from __future__ import annotations
 
+import hashlib
 import os
-from typing import Any, Dict, List
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    # orjson has no wheel for every add-on architecture (e.g. armhf) and
+    # the image cannot build it from source.  The stdlib decoder accepts
+    # bytes too, just more slowly.
+    from json import loads as json_loads
+
+
+# How long (in seconds) a response from each endpoint is reused before
+# asking Home Assistant again.  The configuration only changes across
+# restarts, whereas entity states are expected to move constantly.
+DEFAULT_TTLS: Dict[str, float] = {
+    "/config": 60,
+    "/states": 5,
+    "/template": 5,
+}
+
+# Template rendered by Home Assistant's `/api/template` endpoint to return
+# only the state fields the health analysis reads: every entity's id and
+# state, plus the version attributes of `update.*` entities.  Full
+# attribute dicts make up most of a `/states` body, so this keeps large
+# installations from shipping megabytes that are thrown away.  The cost is
+# a Jinja render over every entity on Home Assistant's event loop, whereas
+# `/states` is served from JSON Home Assistant has already serialised, so
+# the projection is opt-in (see ``HAClient(states_projection=True)``).
+STATES_PROJECTION_TEMPLATE = (
+    "[{%- for s in states -%}"
+    '{"entity_id":{{ s.entity_id | to_json }},"state":{{ s.state | to_json }}'
+    "{%- if s.domain == 'update' -%}"
+    ',"attributes":{"installed_version":{{ s.attributes.get("installed_version") | to_json }},'
+    '"latest_version":{{ s.attributes.get("latest_version") | to_json }}}'
+    "{%- endif -%}"
+    "}{%- if not loop.last -%},{%- endif -%}"
+    "{%- endfor -%}]"
+)
+
+# The Home Assistant version is the only field the dashboard reads from
+# `/config`, and it only changes across upgrades.
+VERSION_TTL = 600
+
+# Responses to the template API that mean it is unsupported, forbidden for
+# this token (`require_admin` answers 401) or failed to render, as opposed
+# to Home Assistant being briefly unavailable.
+TEMPLATE_UNSUPPORTED_STATUSES = frozenset({400, 401, 403, 404, 405})
+
+# After the template API is rejected, the full `/states` list is used for
+# this many seconds before the projection is tried again.
+TEMPLATE_RETRY_BACKOFF = 600
+
+
+class _TTLCache:
+    """Tiny thread-safe mapping of ``path -> (expiry, payload, etag)``.
+
+    Expiry times use :func:`time.monotonic` so that wall-clock changes on
+    the host cannot keep stale entries alive or expire fresh ones.  Expired
+    entries are kept so that their ETag can be used to revalidate them.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[float, Any, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[Any]:
+        """Return the cached payload for ``path`` if it has not expired."""
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def get_stale(self, path: str) -> Optional[Tuple[Any, Optional[str]]]:
+        """Return ``(payload, etag)`` for ``path`` regardless of expiry."""
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return None
+        return entry[1], entry[2]
+
+    def discard(self, path: str) -> None:
+        """Forget any entry for ``path``, fresh or not."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def set(self, path: str, payload: Any, ttl: float, etag: Optional[str] = None) -> None:
+        """Store ``payload`` (and its ``etag``) for ``path`` for ``ttl`` seconds."""
+        with self._lock:
+            self._entries[path] = (time.monotonic() + ttl, payload, etag)
 
 
 class HAClient:
     """Minimal client for accessing Home Assistant's REST API via the Supervisor proxy."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        timeout: float = 10,
+        ttl_overrides: Optional[Dict[str, float]] = None,
+        states_projection: bool = False,
+    ) -> None:
         token = os.environ.get("SUPERVISOR_TOKEN")
         if not token:
             raise RuntimeError(
@@ -31,18 +131,161 @@ class HAClient:
         }
         # Endpoint for the Supervisor proxy; see https://www.home-assistant.io/add-ons/communicating-with-home-assistant
         self._base_url = "http://supervisor/core/api"
+        self._timeout = timeout
+
+        # A single session keeps the connection to the Supervisor alive
+        # between calls, so a dashboard render no longer pays for a new
+        # socket on every `/config` and `/states` request.  The client is
+        # created once per app, so the pool lives for the whole process.
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self._session.mount("http://", adapter)
+
+        # Repeated dashboard refreshes within a few seconds reuse the last
+        # payload instead of hitting the Supervisor again.  A TTL of zero
+        # disables caching for that path.
+        self._ttls = {**DEFAULT_TTLS, **(ttl_overrides or {})}
+        self._cache = _TTLCache()
+        # Fetches currently in flight, one per path.  Concurrent requests
+        # arriving while the cache is cold wait on the same future and get
+        # its result or its exception, instead of each repeating the call.
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._ha_version_cache: Optional[Tuple[float, str]] = None
+        # Whether to fetch states through ``STATES_PROJECTION_TEMPLATE``,
+        # and the monotonic time before which the projection is not retried
+        # after Home Assistant rejected the template API.
+        self._states_projection = states_projection
+        self._projection_retry_at = 0.0
 
     def _request(self, path: str) -> Any:
-        """Internal helper to issue a GET request and return JSON."""
+        """Internal helper to issue a GET request and return JSON.
+
+        Responses are served from the in-process cache while fresh.
+        """
+        return self._fetch(path)[0]
+
+    def _fetch(self, path: str, json_body: Optional[Dict[str, Any]] = None) -> Tuple[Any, str]:
+        """Return ``(payload, key)`` for ``path``.
+
+        ``key`` is a short digest of the raw response body, so callers can
+        tell whether the payload changed without comparing decoded JSON.
+        When ``json_body`` is given the request is a POST carrying it.
+        """
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached
+        with self._inflight_lock:
+            future = self._inflight.get(path)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[path] = future
+        if not leader:
+            return future.result()
+        try:
+            # A previous fetch may have filled the cache just before we
+            # took the lead.
+            result = self._cache.get(path)
+            if result is None:
+                result = self._fetch_uncached(path, json_body)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(path, None)
+
+    def _fetch_uncached(self, path: str, json_body: Optional[Dict[str, Any]]) -> Tuple[Any, str]:
+        """Issue the request for ``path`` and store the result in the cache."""
         url = f"{self._base_url}{path}"
-        resp = requests.get(url, headers=self._headers, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        # Revalidate an expired entry when Home Assistant gave us an
+        # ETag for it; an unchanged resource then comes back as an
+        # empty 304 instead of the full body.
+        stale = self._cache.get_stale(path)
+        headers = {}
+        if stale is not None and stale[1]:
+            headers["If-None-Match"] = stale[1]
+        try:
+            if json_body is None:
+                resp = self._session.get(url, headers=headers, timeout=self._timeout)
+            else:
+                resp = self._session.post(url, json=json_body, timeout=self._timeout)
+            if resp.status_code == 304 and stale is not None:
+                result, etag = stale
+            else:
+                resp.raise_for_status()
+                # Decode straight from the body bytes: `resp.json()` would
+                # first build a full `str` copy of what can be a
+                # multi-megabyte payload, and orjson (when installed) parses
+                # large object-heavy documents much faster than the stdlib
+                # decoder.
+                body = resp.content
+                key = hashlib.blake2b(body, digest_size=8).hexdigest()
+                result = (json_loads(body), key)
+                etag = resp.headers.get("ETag")
+        except requests.RequestException:
+            # Home Assistant is likely restarting; forget the cached
+            # version (and the config it came from) so the next
+            # successful call picks up an upgrade.
+            self._ha_version_cache = None
+            self._cache.discard("/config")
+            raise
+        ttl = self._ttls.get(path, 0)
+        if ttl > 0:
+            self._cache.set(path, result, ttl, etag)
+        return result
 
     def get_config(self) -> Dict[str, Any]:
         """Return the Home Assistant config information (version, location, etc.)."""
         return self._request("/config")
 
+    def get_ha_version(self) -> str:
+        """Return the Home Assistant version, refreshing it at most every ``VERSION_TTL`` seconds.
+
+        The cached version is dropped whenever a Supervisor call fails, so
+        the first successful call after a restart re-reads `/config`.
+        """
+        cached = self._ha_version_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < VERSION_TTL:
+            return cached[1]
+        config = self.get_config()
+        version = config.get("version", "unknown")
+        self._ha_version_cache = (now, version)
+        return version
+
     def get_states(self) -> List[Dict[str, Any]]:
         """Return the list of all entity states."""
-        return self._request("/states")
\ No newline at end of file
+        return self._request("/states")
+
+    def get_states_with_key(self) -> Tuple[List[Dict[str, Any]], str]:
+        """Return entity states for analysis along with a digest of the raw response.
+
+        By default this is the full `/states` list.  With
+        ``states_projection`` enabled, states are projected server-side by
+        ``STATES_PROJECTION_TEMPLATE``, so each one only carries
+        ``entity_id``, ``state`` and, for update entities, their version
+        attributes.  If Home Assistant rejects the template API as
+        unsupported, forbidden or unrenderable, the full `/states` list is
+        used for ``TEMPLATE_RETRY_BACKOFF`` seconds.  Other failures (e.g. a
+        502 while Home Assistant restarts) are raised so the projection is
+        tried again next time.
+        """
+        if self._states_projection and time.monotonic() >= self._projection_retry_at:
+            try:
+                return self._fetch("/template", {"template": STATES_PROJECTION_TEMPLATE})
+            except requests.HTTPError as exc:
+                status = exc.response.status_code if exc.response is not None else None
+                if status not in TEMPLATE_UNSUPPORTED_STATUSES:
+                    raise
+                self._projection_retry_at = time.monotonic() + TEMPLATE_RETRY_BACKOFF
+        return self._fetch("/states")
\ No newline at end of file
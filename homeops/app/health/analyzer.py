@@ -14,17 +14,44 @@ Discord bots) can rely on the same underlying logic.
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Any, Dict, Iterable, List, Tuple
-
-IMPORTANT_DOMAINS = {
-    "light",
-    "switch",
-    "lock",
-    "climate",
-    "cover",
-    "fan",
-    "media_player",
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+IMPORTANT_DOMAINS = frozenset(
+    {
+        "light",
+        "switch",
+        "lock",
+        "climate",
+        "cover",
+        "fan",
+        "media_player",
+    }
+)
+
+# States that mark an entity as unavailable.
+UNAVAILABLE_STATES = frozenset({"unavailable", "unknown"})
+
+
+# Fixed report text.  Reports are read-only once built, so every report
+# shares these objects instead of allocating fresh copies per request.
+_CRITICAL_DESCRIPTION = (
+    "Core device domains (lights, climate, locks, media) are unavailable. "
+    "This usually indicates an integration outage, coordinator issue, or network/device power problem."
+)
+
+# Concrete first steps shown in the start-here list
+_CRITICAL_START_HERE: Tuple[str, ...] = (
+    "Check whether the affected integration(s) show errors in Settings → Devices & services.",
+    "If the affected devices are Zigbee/Z-Wave, verify the coordinator is online and not rebooting.",
+    "If this started after an update or restart, review what changed recently before rebooting repeatedly.",
+)
+
+_HEALTHY_REPORT: Dict[str, Any] = {
+    "headline": "No critical issues detected",
+    "description": "All core devices appear to be operating normally.",
+    "start_here": (),
+    "details": "",
 }
 
 
@@ -69,28 +96,34 @@ def analyze_health(states: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
             A list of dictionaries containing ``entity_id``, ``installed``,
             and ``latest`` for each update entity with an available update.
     """
-    unavailable: List[str] = []
-    critical_unavailable: List[str] = []
-    by_domain: Dict[str, List[str]] = defaultdict(list)
+    total_unavailable = 0
+    critical_unavailable = 0
+    by_domain_counts: Counter[str] = Counter()
     updates: List[Dict[str, Any]] = []
 
+    # Hoist lookups out of the per-entity loop; large installations can
+    # report thousands of states.
+    important = IMPORTANT_DOMAINS
+    unavailable_states = UNAVAILABLE_STATES
+
     for state in states:
         entity_id: str = state.get("entity_id", "")
-        entity_state: str = state.get("state") or ""
-        attrs: Dict[str, Any] = state.get("attributes", {})
-
-        # Normalize domain name
-        domain = entity_id.split(".")[0] if "." in entity_id else "unknown"
-
-        # Track unavailable entities
-        if entity_state in ("unavailable", "unknown"):
-            unavailable.append(entity_id)
-            by_domain[domain].append(entity_id)
-            if domain in IMPORTANT_DOMAINS:
-                critical_unavailable.append(entity_id)
-
-        # Track updates
-        if domain == "update":
+        # A missing (None) state simply never matches below.
+        entity_state: Optional[str] = state.get("state")
+
+        # Track unavailable entities.  The domain is only needed here, so
+        # it is sliced out lazily rather than for every entity.
+        if entity_state in unavailable_states:
+            idx = entity_id.find(".")
+            domain = entity_id[:idx] if idx >= 0 else "unknown"
+            total_unavailable += 1
+            by_domain_counts[domain] += 1
+            if domain in important:
+                critical_unavailable += 1
+
+        # Track updates; attributes are only needed for update entities
+        if entity_id.startswith("update."):
+            attrs: Dict[str, Any] = state.get("attributes", {})
             latest = attrs.get("latest_version")
             installed = attrs.get("installed_version")
             # state == 'on' also indicates an update is available
@@ -104,7 +137,7 @@ def analyze_health(states: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
                 )
 
     # Determine severity
-    if len(critical_unavailable) >= 5:
+    if critical_unavailable >= 5:
         severity = "critical"
     elif critical_unavailable or updates:
         severity = "warning"
@@ -112,16 +145,13 @@ def analyze_health(states: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         severity = "healthy"
 
     # Sort domain counts descending
-    sorted_domain_counts: Dict[str, int] = {
-        domain: len(entities)
-        for domain, entities in sorted(by_domain.items(), key=lambda item: len(item[1]), reverse=True)
-    }
+    sorted_domain_counts: Dict[str, int] = dict(by_domain_counts.most_common())
 
     return {
         "severity": severity,
         "unavailable": {
-            "total_count": len(unavailable),
-            "critical_count": len(critical_unavailable),
+            "total_count": total_unavailable,
+            "critical_count": critical_unavailable,
             "by_domain": sorted_domain_counts,
         },
         "updates": {
@@ -144,29 +174,12 @@ def build_report(health: Dict[str, Any]) -> Dict[str, Any]:
     severity = health.get("severity")
 
     if severity == "healthy":
-        return {
-            "headline": "No critical issues detected",
-            "description": "All core devices appear to be operating normally.",
-            "start_here": [],
-            "details": "",
-        }
+        return _HEALTHY_REPORT
 
     # Build headline and description
     crit_count = unavailable.get("critical_count", 0)
     headline = f"{crit_count} critical devices unavailable"
 
-    description = (
-        "Core device domains (lights, climate, locks, media) are unavailable. "
-        "This usually indicates an integration outage, coordinator issue, or network/device power problem."
-    )
-
-    # Build a start-here list of concrete steps
-    start_here: List[str] = [
-        "Check whether the affected integration(s) show errors in Settings → Devices & services.",
-        "If the affected devices are Zigbee/Z-Wave, verify the coordinator is online and not rebooting.",
-        "If this started after an update or restart, review what changed recently before rebooting repeatedly.",
-    ]
-
     # Build details: show the top three impacted domains and the count in parentheses
     by_domain = unavailable.get("by_domain", {})
     # Only include domains that are important or have significant impact
@@ -184,7 +197,7 @@ def build_report(health: Dict[str, Any]) -> Dict[str, Any]:
 
     return {
         "headline": headline,
-        "description": description,
-        "start_here": start_here,
+        "description": _CRITICAL_DESCRIPTION,
+        "start_here": _CRITICAL_START_HERE,
         "details": details,
     }
\ No newline at end of file
@@ -3,7 +3,9 @@
 This module defines simple dataclasses representing the health state
 and report structure.  While Python dictionaries are currently
 sufficient, these classes can be used for static type checking or
-future extensions.  They are kept simple to avoid runtime overhead.
+future extensions.  They are kept simple to avoid runtime overhead:
+instances are immutable and use ``__slots__`` instead of a per-instance
+``__dict__``.
 """
 
 from __future__ import annotations
@@ -12,7 +14,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HealthSummary:
     """Summary of the Home Assistant health state."""
 
@@ -23,7 +25,7 @@ class HealthSummary:
     update_count: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HealthReport:
     """Opinionated human‑readable report based on a health summary."""
 
@@ -1,28 +1,39 @@
 """WSGI entrypoint for HomeOps Doctor.
 
-When executed directly, this module will construct the Flask
-application using the factory defined in :mod:`app.__init__` and
-serve it on port 8099.  This port is fixed because Home Assistant
-expects ingress add‑ons to bind to port 8099 inside the container.
-
-Note that this uses Flask’s built‑in development server.  In
-production environments you may wish to run under a WSGI server
-such as Gunicorn, but for Home Assistant add‑ons the development
-server is sufficient.
+When executed directly, this module replaces itself with a Gunicorn
+server that builds the Flask application using the factory defined in
+:mod:`app.__init__` and serves it on port 8099.  This port is fixed
+because Home Assistant expects ingress add‑ons to bind to port 8099
+inside the container.
+
+Flask’s built‑in development server handles requests one at a time,
+so a slow call to the Supervisor would hold up every other client.
+Gunicorn runs a single worker process with eight threads.  The request
+path is dominated by waiting on Home Assistant or reading the shared
+report snapshot, so threads give the concurrency, and one process keeps
+a single cache and background refresher instead of one per worker.
 """
 
-# Import the create_app factory from the package.  Use an absolute
-# import here rather than a relative one so that the module can be
-# executed directly as a script ("python app/main.py").  When run as
-# a script, Python sets __package__ to None and relative imports fail.
-from app import create_app
+import os
+
+# Gunicorn command line.  `app:create_app()` is resolved relative to the
+# working directory, which the Dockerfile sets to the add-on root.
+GUNICORN_ARGS = [
+    "gunicorn",
+    "--bind",
+    "0.0.0.0:8099",
+    "--workers",
+    "1",
+    "--threads",
+    "8",
+    "app:create_app()",
+]
 
 
 def main() -> None:
-    """Run the Flask application if executed as a script."""
-    app = create_app()
+    """Run the application under Gunicorn if executed as a script."""
     # Bind to all addresses on the reserved ingress port (8099)
-    app.run(host="0.0.0.0", port=8099)
+    os.execvp(GUNICORN_ARGS[0], GUNICORN_ARGS)
 
 
 if __name__ == "__main__":